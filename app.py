@@ -1,13 +1,24 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for
+import re
+import shutil
+from collections import OrderedDict
+from flask import Flask, Response, request, redirect, url_for, stream_with_context
+from jinja2 import FileSystemBytecodeCache
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import logging
-from flask import current_app
 
 app = Flask(__name__)
 
+# The template never changes at runtime: skip the per-render mtime check and
+# keep compiled template bytecode on disk so restarts don't recompile it.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 logging.basicConfig(filename='vm_manager.log', level=logging.INFO)
 
 VM_DIRECTORY = {
@@ -15,6 +26,105 @@ VM_DIRECTORY = {
     "20_lab_vulnhub_2004-2009": "/home/username/vmware/20_lab_vulnhub_2004-2009/"
 }
 
+# Resolved once: an absolute executable path skips the PATH search on every
+# call and is one of the conditions for subprocess's posix_spawn fast path.
+VMRUN_PATH = shutil.which("vmrun") or "vmrun"
+
+class _LRU(OrderedDict):
+    """Dict with LRU eviction, so deleted or renamed VMs don't pile up in the
+    caches over the lifetime of the process. Reads and writes take an internal
+    lock because _gather_one mutates the caches from worker threads."""
+
+    def __init__(self, capacity=1024):
+        super().__init__()
+        self.capacity = capacity
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            if len(self) > self.capacity:
+                self.popitem(last=False)
+
+
+# Guest IPs rarely change between refreshes; cache them briefly to avoid
+# forking vmrun for every running VM on every page load.
+IP_CACHE_SECONDS = 30
+_ip_cache = _LRU()  # vmx_path -> (ip_address, timestamp)
+
+# Parsed .vmx data is static until the file changes on disk, so key the cache
+# on st_mtime_ns rather than a TTL: re-parse only when the file actually changed.
+vm_cache = _LRU()  # vmx_path -> {"mtime": st_mtime_ns, "mac_addresses": [...]}
+
+# Scan results for vmware.log and .vmsd are cached per path, keyed on
+# (st_mtime_ns, st_size): unchanged files are never re-read.
+_log_cache = _LRU()  # log_path -> ((mtime_ns, size), [error lines])
+
+# Only the tail of vmware.log is scanned for errors; fatal messages appear at
+# the end, and this bounds the scan for logs that have grown to tens of MB.
+LOG_TAIL_BYTES = 256 * 1024
+_vmsd_cache = _LRU()  # vmsd_path -> ((mtime_ns, size), (active name, [names]))
+
+# The GUI check is cheap but pointless to repeat on rapid refreshes.
+WORKSTATION_GUI_EXE = "/usr/lib/vmware/bin/vmware"
+GUI_CHECK_SECONDS = 5
+_gui_state = {"ts": 0.0, "running": False}
+
+# vmrun list output, held for a few seconds so browser auto-refresh doesn't
+# fork vmrun per request. Reset to 0 after an action to force a fresh list.
+RUNNING_LIST_SECONDS = 3
+_running_state = {"ts": 0.0, "paths": frozenset()}
+
+# One pool shared by all requests: spinning up and joining a fresh executor
+# per page load pays thread start/teardown for every refresh.
+_executor = ThreadPoolExecutor(max_workers=16)
+
+# Start/stop/snapshot run here so the POST response doesn't wait the seconds
+# a vmrun action takes; manage_vm invalidates the caches when it finishes.
+_action_pool = ThreadPoolExecutor(max_workers=4)
+
+# Whole-result hold for get_all_vm_info: repeated loads within the window
+# reuse the last result outright (no walk, no stats, no vmrun). Actions
+# invalidate it so a post-action reload is always recomputed.
+VM_INFO_SECONDS = 3
+_vm_info_state = {"ts": 0.0, "data": None}
+
+
+def _invalidate_vm_info():
+    """Forces the next page load to recompute VM state from scratch."""
+    _vm_info_state["ts"] = 0.0
+    _running_state["ts"] = 0.0
+
+# Matches whole log lines containing one of the fatal keywords; bytes pattern
+# so it can run directly over the raw vmware.log tail without decoding it.
+_LOG_ERROR_RE = re.compile(rb'(?im)^.*(?:unrecoverable|panic|coredump).*$')
+# Keyword-only prefilter for the common clean-log case: one scan, no line
+# anchoring, stops at the first hit.
+_LOG_ERROR_KEY_RE = re.compile(rb'(?i)unrecoverable|panic|coredump')
+
+# Captures every snapshot field we care about from a .vmsd in one pass:
+# snapshot.current plus snapshotN.uid/displayName/description. Bytes pattern,
+# like the .vmx and log ones, so the file never goes through a full decode.
+_VMSD_FIELD_RE = re.compile(rb'^(snapshot(?:\.current|\d+\.(?:uid|displayName|description)))\s*=\s*"([^"]*)"', re.M)
+
+# displayName and ethernetN NIC fields from a .vmx, again in one C-level pass
+# over raw bytes. "generatedAddress" does not match the Offset lines because
+# of the "=" that must follow.
+_VMX_FIELD_RE = re.compile(rb'^(displayName|ethernet(\d+)\.(vnet|generatedAddress))\s*=\s*"([^"]*)"', re.I | re.M)
+
 
 
 
@@ -27,69 +137,69 @@ def timed_function(func):
         result = func(*args, **kwargs)
         end_time = time.time()
         execution_time = end_time - start_time
-        print(f"Function {func.__name__} took {execution_time:.2f} seconds to execute")  # Debug message
+        logging.debug(f"Function {func.__name__} took {execution_time:.2f} seconds to execute")
         return result
     return wrapper
 
+def _scan_vmx(root, out):
+    """Collects .vmx file paths below root using os.scandir (fewer stat calls than os.walk)."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        # Hidden entries and .lck directories never contain
+                        # .vmx files; skipping them avoids descending into
+                        # lock dirs that can vanish mid-scan.
+                        if entry.name.startswith('.') or entry.name.endswith('.lck'):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".vmx"):
+                            # entry.stat() reuses the data the directory scan
+                            # already fetched, so the mtime is nearly free here
+                            # and saves a stat per VM later.
+                            out.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+
 @timed_function
 def find_vmx_files_with_walk(directories):
-    vmx_files = {} 
+    vmx_files = {}
 
     for lab_name, directory in directories.items():
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith(".vmx"):
-                    if lab_name not in vmx_files:
-                        vmx_files[lab_name] = [] 
-                    vmx_files[lab_name].append(os.path.join(root, file))  
+        vmx_files[lab_name] = []
+        _scan_vmx(directory, vmx_files[lab_name])
 
-    return vmx_files 
+    return vmx_files
 
 
 # --- New Functions ---
-@timed_function
-def get_vm_status(vm_info, vmx_path):
-    """Gets the running status of a VM using the cached vm_info."""
-    vm_name = os.path.basename(vmx_path).split(".")[0]
-    lab_name = vmx_path.split('/')[-2] # Extract lab name from vmx_path
-    vm_data = vm_info.get((lab_name, vm_name))
-    return "Running" if vm_data["complete"] else "Stopped"
+def _parse_vmx(vmx):
+    """Extracts the display name and deduplicated MAC addresses from a .vmx file."""
+    with open(vmx, 'rb') as f:
+        buf = f.read()
 
-
-@timed_function
-def get_vm_network_details(vmx_path):
-    """Gets all MAC addresses and the first available IPv4 address (or N/A) using vmrun."""
-
-    mac_addresses = []
-    ip_address = "N/A"
-
-    # Get MAC addresses from .vmx file, avoiding duplicates and offset lines
+    display_name = None
+    nics = []
     seen_macs = set()
-    with open(vmx_path, 'r') as f:
-        for line in f:
-            if line.startswith("ethernet") and "generatedAddress" in line:
-                mac = line.split("=")[1].strip().strip('"')
-                if mac not in seen_macs and not mac.isdigit():  # Filter out duplicates and offsets
-                    mac_addresses.append(mac)
-                    seen_macs.add(mac)
-
-    if not mac_addresses:
-        return ["No MAC addresses found in .vmx file"]
-
-    # Get first available IPv4 address using getGuestIPAddresses
-    status = get_vm_status(vmx_path)
-    if status == "Running":
-        command = ["vmrun", "-T", "ws", "getGuestIPAddresses", vmx_path]
-        result = subprocess.run(command, capture_output=True, text=True)
+    for m in _VMX_FIELD_RE.finditer(buf):
+        if m.group(1).lower() == b"displayname":
+            display_name = m.group(4).decode('utf-8', 'ignore')
+        elif m.group(3) and m.group(3).lower() == b"generatedaddress":
+            mac = m.group(4).decode('utf-8', 'ignore')
+            if mac not in seen_macs:
+                nics.append((int(m.group(2)), mac))
+                seen_macs.add(mac)
 
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                if line.startswith("ethernet"):
-                    ip_address = line.split()[1].strip()  # Get the first valid IP
-                    break  # Stop after finding one
-
-    mac_info = ", ".join(f"MAC: {mac}" for mac in mac_addresses)
-    return [f"IPv4: {ip_address}"] + mac_addresses   # Combine details (IP first, then MACs)
+    # Sort by adapter index here, once per parse, so cache hits never sort.
+    nics.sort()
+    return display_name, [mac for _, mac in nics]
 
 
 @timed_function
@@ -97,122 +207,330 @@ def manage_vm(vmx_path, action):
     """Starts, stops, or restarts a VM using vmrun in headless mode."""
 
     if action == "start":
-        command = ["vmrun", "-T", "ws", action, vmx_path, "nogui"]  # Always add 'nogui' for start
+        args = ["-T", "ws", action, vmx_path, "nogui"]  # Always add 'nogui' for start
+    elif action == "snapshot":
+        # Snapshots are named after the current date and time.
+        snapshot_name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        args = ["-T", "ws", action, vmx_path, snapshot_name]
     else:
-        command = ["vmrun", "-T", "ws", action, vmx_path]           # No 'nogui' needed for stop/reset
+        args = ["-T", "ws", action, vmx_path]           # No 'nogui' needed for stop/reset
 
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = _run_vmrun(args, check=True)
     except subprocess.CalledProcessError as e:
         logging.error(f"Error executing vmrun (return code {e.returncode}): {e.stderr}")
         raise
+    finally:
+        # VM state just changed (or may have); don't serve cached data to the
+        # reload that follows the action.
+        _invalidate_vm_info()
+
+    logging.info(f"vmrun {action} succeeded for {vmx_path}: {result.stdout.strip()}")
+
+
+
+def check_for_locks(vm_dir):
+    """Returns True if the VM directory contains leftover .lck entries."""
+    try:
+        with os.scandir(vm_dir) as it:
+            return any(entry.name.endswith(".lck") for entry in it)
+    except OSError:
+        return False
+
+
+def get_vmsd_info(vmsd_path):
+    """Returns (active snapshot name, list of snapshot names) from one .vmsd read."""
+    try:
+        st = os.stat(vmsd_path)
+    except OSError:
+        # No .vmsd means no snapshots yet.
+        return None, []
+
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _vmsd_cache.get(vmsd_path)
+    if cached and cached[0] == stat_key:
+        return cached[1]
+
+    try:
+        with open(vmsd_path, 'rb') as f:
+            buf = f.read()
+    except OSError:
+        return None, []
+
+    # One regex pass collects every field at once instead of looping over the
+    # lines three times (current uid, uid->index, then name/description).
+    # Only the captured key/value slices get decoded, not the whole file.
+    fields = {key.decode('ascii'): value.decode('utf-8', 'ignore')
+              for key, value in _VMSD_FIELD_RE.findall(buf)}
+
+    entries = []
+    for key, value in fields.items():
+        if key.endswith(".displayName"):
+            entries.append((int(key[len("snapshot"):-len(".displayName")]), value))
+    snapshots = [name for _, name in sorted(entries)]
+
+    active = None
+    current_uid = fields.get("snapshot.current")
+    if current_uid:
+        for key, value in fields.items():
+            if key.endswith(".uid") and value == current_uid:
+                index = key[len("snapshot"):-len(".uid")]
+                active = fields.get(f"snapshot{index}.displayName") or fields.get(f"snapshot{index}.description")
+                break
+
+    info = (active, snapshots)
+    _vmsd_cache[vmsd_path] = (stat_key, info)
+    return info
+
+
+def _run_vmrun(args, check=False, text=True):
+    """Runs vmrun with the given argument list; every vmrun call goes through here."""
+    # close_fds=False (plus the absolute executable path) lets subprocess use
+    # posix_spawn instead of fork, skipping the page-table copy of the Flask
+    # process on every call. We open no inheritable fds worth guarding.
+    return subprocess.run([VMRUN_PATH, *args], capture_output=True, text=text,
+                          check=check, close_fds=False)
+
+
+def _list_running_vms():
+    """Returns the set of running .vmx paths from vmrun list, cached briefly."""
+    now = time.monotonic()
+    if now - _running_state["ts"] < RUNNING_LIST_SECONDS:
+        return _running_state["paths"]
+
+    # Bytes output: only the .vmx lines get decoded, not the header/noise.
+    result = _run_vmrun(["list"], text=False)
+    # Resolve symlinks so membership tests can't silently miss when vmrun
+    # reports a different spelling of the same path than the walk found.
+    paths = frozenset(os.path.realpath(line.strip().decode('utf-8', 'ignore'))
+                      for line in result.stdout.splitlines() if line.endswith(b".vmx"))
+
+    _running_state["ts"] = now
+    _running_state["paths"] = paths
+    return paths
+
+
+def is_workstation_gui_running():
+    """Checks whether the Workstation GUI is open (it can fight over the same VMs)."""
+    now = time.monotonic()
+    if now - _gui_state["ts"] < GUI_CHECK_SECONDS:
+        return _gui_state["running"]
+
+    # Walk /proc directly instead of forking pgrep; stop at the first match.
+    # cmdline is readable for other users' processes, unlike the exe symlink.
+    running = False
+    target = WORKSTATION_GUI_EXE.encode() + b"\x00"
+    try:
+        with os.scandir('/proc') as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry.name}/cmdline", 'rb') as f:
+                        cmdline = f.read()
+                except OSError:
+                    continue
+                if cmdline.startswith(target):
+                    running = True
+                    break
+    except OSError:
+        pass
+
+    _gui_state["ts"] = now
+    _gui_state["running"] = running
+    return running
+
+
+def check_vm_logs_for_errors(vm_dir):
+    """Returns log lines with unrecoverable/panic/coredump from the tail of vmware.log."""
+    log_file = os.path.join(vm_dir, "vmware.log")
+    try:
+        st = os.stat(log_file)
+    except OSError:
+        return []
+    if st.st_size == 0:
+        return []
+
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _log_cache.get(log_file)
+    if cached and cached[0] == stat_key:
+        return cached[1]
+
+    # Fatal errors show up at the end of the log, so a bounded tail read keeps
+    # the per-call cost O(LOG_TAIL_BYTES) no matter how large the log grows.
+    try:
+        with open(log_file, 'rb') as f:
+            if st.st_size > LOG_TAIL_BYTES:
+                f.seek(st.st_size - LOG_TAIL_BYTES)
+                data = f.read()
+                # Drop the partial first line left by seeking mid-file.
+                newline = data.find(b'\n')
+                if newline != -1:
+                    data = data[newline + 1:]
+            else:
+                data = f.read()
+    except OSError:
+        return []
+
+    # Most logs contain none of the keywords; bail out on the cheap search
+    # before extracting whole lines.
+    if not _LOG_ERROR_KEY_RE.search(data):
+        error_lines = []
+    else:
+        error_lines = [m.group(0).decode('utf-8', 'ignore').strip()
+                       for m in _LOG_ERROR_RE.finditer(data)]
+
+    _log_cache[log_file] = (stat_key, error_lines)
+    return error_lines
 
-    # Print output for debugging in the console (optional)
-    if result.returncode != 0:
-        print("Error:", result.stderr, flush=True)
+
+def _gather_one(lab_name, vmx, vmx_mtime, running_vm_paths):
+    """Collects status, MAC and IP details for a single VM (runs on a worker thread)."""
+    vm_name = os.path.basename(vmx).split(".")[0]
+
+    ip_addresses = []
+    details = []
+
+    cached = vm_cache.get(vmx)
+    if cached and cached["mtime"] == vmx_mtime:
+        display_name = cached["display_name"]
+        mac_addresses = cached["mac_addresses"]
+        mac_details = cached["mac_details"]
+        real_vmx = cached["realpath"]
+        vm_dir = cached["vm_dir"]
+        vmsd_path = cached["vmsd_path"]
     else:
-        print("Success:", result.stdout, flush=True)
+        display_name, mac_addresses = _parse_vmx(vmx)
+        # Pre-format the static detail lines so warm requests just extend().
+        mac_details = [f"MAC: {mac}" for mac in mac_addresses]
+        # Resolved once per parse; the running set holds realpaths too. The
+        # derived paths are remembered as well so hits skip the string ops.
+        real_vmx = os.path.realpath(vmx)
+        vm_dir = os.path.dirname(vmx)
+        vmsd_path = os.path.splitext(vmx)[0] + ".vmsd"
+        vm_cache[vmx] = {"mtime": vmx_mtime, "display_name": display_name,
+                         "mac_addresses": mac_addresses, "mac_details": mac_details,
+                         "realpath": real_vmx, "vm_dir": vm_dir, "vmsd_path": vmsd_path}
+
+    is_running = real_vmx in running_vm_paths
 
+    if not mac_addresses:
+        details.append("No MAC addresses found in .vmx file")
+
+    # Get IPv4 addresses using getGuestIPAddress (singular) only if VM is running
+    if is_running:
+        cached = _ip_cache.get(vmx)
+        if cached and (time.time() - cached[1]) < IP_CACHE_SECONDS:
+            ip_addresses.append(cached[0])
+        else:
+            result = _run_vmrun(["-T", "ws", "getGuestIPAddress", vmx])
+
+            if result.returncode == 0:
+                # Assuming the first valid IP address found for an interface is the correct one
+                ip_address = result.stdout.splitlines()[0].strip()
+                ip_addresses.append(ip_address)
+                _ip_cache[vmx] = (ip_address, time.time())
+            else:
+                logging.error(f"Error retrieving IP for {vmx}: {result.stderr}")
+                ip_addresses = ["Error retrieving IP"]
+
+    # If the VM is not running, add "N/A" for IPv4
+    if not ip_addresses:
+        ip_addresses = ["N/A"]
+
+    # Combine MAC and IP details (only the first IP address)
+    details.append(f"IPv4: {ip_addresses[0]}")
+    details.extend(mac_details)
+
+    # A stopped VM with leftover .lck entries usually won't start until they
+    # are cleaned up, so surface that.
+    if not is_running and check_for_locks(vm_dir):
+        details.append("Warning: stale .lck present")
+
+    if is_running:
+        error_lines = check_vm_logs_for_errors(vm_dir)
+        if error_lines:
+            details.append(f"Log errors: {len(error_lines)}")
+
+    active_snapshot, snapshots = get_vmsd_info(vmsd_path)
+    if active_snapshot:
+        details.append(f"Snapshot: {active_snapshot} ({len(snapshots)} total)")
+    elif snapshots:
+        details.append(f"Snapshots: {len(snapshots)}")
+
+    return lab_name, {
+        "title": display_name or vm_name,
+        "complete": is_running,
+        "vmx_path": vmx,
+        "details": details
+    }
 
 
 @timed_function
 def get_all_vm_info(directories):
     """Gets info for all VMs, including running status, MAC, and IP (if running)."""
 
-    result = subprocess.run(["vmrun", "list"], capture_output=True, text=True)
-    running_vm_files = [os.path.basename(line.strip()) for line in result.stdout.splitlines() if line.endswith(".vmx")]
-
-    vm_info = {}
-
-    for lab_name, vmx_list in find_vmx_files_with_walk(directories).items():
-        for vmx in vmx_list:
-            vm_name = os.path.basename(vmx).split(".")[0]
-            is_running = os.path.basename(vmx) in running_vm_files
-
-            mac_addresses = []
-            ip_addresses = []  
-            details = []
-
-            # Get MAC addresses from .vmx file, avoiding duplicates and offset lines
-            seen_macs = set()
-            with open(vmx, 'r') as f:
-                for line in f:
-                    if line.startswith("ethernet") and "generatedAddress" in line:
-                        mac = line.split("=")[1].strip().strip('"')
-                        if mac not in seen_macs and not mac.isdigit():  # Filter out duplicates and offsets
-                            mac_addresses.append(mac)
-                            seen_macs.add(mac)
-
-            if not mac_addresses:
-                return ["No MAC addresses found in .vmx file"]
-
-            # Get IPv4 addresses using getGuestIPAddress (singular) only if VM is running
-            if is_running:
-                command = ["vmrun", "-T", "ws", "getGuestIPAddress", vmx] # <--- corrected this line
-                result = subprocess.run(command, capture_output=True, text=True)
-
-                if result.returncode == 0:
-                    # Assuming the first valid IP address found for an interface is the correct one
-                    ip_address = result.stdout.splitlines()[0].strip()
-                    ip_addresses.append(ip_address)
-                else:
-                    logging.error(f"Error retrieving IP for {vmx}: {result.stderr}")
-                    ip_addresses = ["Error retrieving IP"] 
-
-            # If the VM is not running, add "N/A" for IPv4
-            if not ip_addresses:
-                ip_addresses = ["N/A"] 
-
-            # Combine MAC and IP details (only the first IP address)
-            if ip_addresses:
-                details.append(f"IPv4: {ip_addresses[0]}") 
-            details.extend([f"MAC: {mac}" for mac in mac_addresses]) 
-
-            vm_info[(lab_name, vm_name)] = {
-                "title": vm_name,
-                "complete": is_running,
-                "vmx_path": vmx,
-                "details": details
-            }
-            current_app.logger.debug(f"VM info for {vm_name}: {vm_info[(lab_name, vm_name)]}") # Additional debugging
-            current_app.logger.debug(f"Result of vmrun getGuestIPAddresses for {vm_name}: {result}")
-    current_app.logger.debug(f"get_all_vm_info function finished, returning data: {vm_info}")
-    return vm_info
+    now = time.monotonic()
+    if _vm_info_state["data"] is not None and now - _vm_info_state["ts"] < VM_INFO_SECONDS:
+        return _vm_info_state["data"]
+
+    # The running-VM query and the directory walk are independent, so let
+    # vmrun list run on a worker while this thread walks the lab trees.
+    running_future = _executor.submit(_list_running_vms)
+    all_vmx_files_by_lab = find_vmx_files_with_walk(directories)
+    running_vm_paths = running_future.result()
+    # Reverse index for O(1) lab lookup per .vmx path, instead of scanning
+    # each lab's list (or guessing the lab from path components). The walk
+    # already delivers the mtime, so the cache key costs no extra stat.
+    vmx_meta = {vmx: (lab, mtime)
+                for lab, vmx_list in all_vmx_files_by_lab.items()
+                for vmx, mtime in vmx_list}
+
+    # Fan the per-VM work (vmx parse + vmrun IP query) out over threads; the
+    # subprocess waits and file I/O release the GIL, so N VMs cost ~1 VM.
+    vm_data_by_lab = {}
+    results = _executor.map(
+        lambda item: _gather_one(item[1][0], item[0], item[1][1], running_vm_paths),
+        vmx_meta.items())
+    for lab_name, vm_data in results:
+        vm_data_by_lab.setdefault(lab_name, []).append(vm_data)
+
+    # Hand the template a dict that is already sorted by lab and VM title.
+    for vm_list in vm_data_by_lab.values():
+        vm_list.sort(key=lambda vm: vm["title"])
+    vm_data_by_lab = dict(sorted(vm_data_by_lab.items()))
+
+    _vm_info_state["ts"] = now
+    _vm_info_state["data"] = vm_data_by_lab
+
+    app.logger.debug(f"get_all_vm_info function finished, returning data: {vm_data_by_lab}")
+    return vm_data_by_lab
 
 # --- Flask Routes ---
 @app.route("/", methods=["GET", "POST"])
 def index():
-    vmx_files = find_vmx_files_with_walk(VM_DIRECTORY)
-    vm_info = get_all_vm_info(VM_DIRECTORY)  # Fetch VM info before each request
-    vm_data_by_lab = {}
-
     if request.method == 'POST':
         vmx_path = request.form['vmx_path']
         action = request.form['action']
-
-        # Fix for get_vm_status call:
-        vm_name = os.path.basename(vmx_path).split(".")[0]
-        lab_name = vmx_path.split('/')[-2]  
-
-        # Refreshed the VM status before performing the action
-        manage_vm(vmx_path, action) 
-        vm_info = get_all_vm_info(VM_DIRECTORY)  # Refresh VM info after the action
-        # Update the status based on the new vm_info
-
-        return redirect(url_for("index"))  
-    # Prepare data for the template, grouping by lab and sorting
-    for (lab_name, vm_name), vm_data in vm_info.items():
-        if lab_name not in vm_data_by_lab:
-            vm_data_by_lab[lab_name] = []
-        vm_data_by_lab[lab_name].append(vm_data)
-
-    # Sort labs and VMs within each lab
-    sorted_labs = sorted(vm_data_by_lab.keys())
-    for lab_name in sorted_labs:
-        vm_data_by_lab[lab_name].sort(key=lambda vm: vm["title"])
-
-    print("VM data:", vm_data_by_lab) 
-    return render_template("index.html", vm_data_by_lab=vm_data_by_lab)
+        # Fire and redirect: the reload renders right away with the last
+        # known state, and the status flips once the action completes.
+        _action_pool.submit(manage_vm, vmx_path, action)
+        return redirect(url_for("index"))
+
+    # get_all_vm_info already groups by lab and sorts, so there is nothing
+    # left to post-process here.
+    vm_data_by_lab = get_all_vm_info(VM_DIRECTORY)
+
+    # Stream the render instead of materializing the whole page first, so the
+    # browser starts receiving HTML while the later lab sections still render.
+    context = {"vm_data_by_lab": vm_data_by_lab,
+               "gui_running": is_workstation_gui_running()}
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template("index.html").stream(context)
+    # Group a handful of template events per write so the WSGI layer isn't
+    # fed hundreds of tiny chunks.
+    stream.enable_buffering(5)
+    return Response(stream_with_context(stream))
 
 
 
@@ -0,0 +1,13 @@
+"""Gunicorn configuration for running the VM manager in production.
+
+The caches in app.py live in process memory, so a single worker with threads
+is preferred: extra workers would each poll vmrun and parse the lab
+directories independently. Threads are enough because requests spend their
+time waiting on vmrun and file I/O.
+"""
+
+bind = "0.0.0.0:5000"
+workers = 1
+threads = 8
+worker_class = "gthread"
+timeout = 120